@@ -5,15 +5,32 @@ using Yahoo Finance data via the yfinance library.
 """
 
 # Standard library imports
-import io
-from datetime import datetime, timedelta
+import html
+import json
+import math
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
 
 # Third-party imports
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import streamlit as st
 import yfinance as yf
+from curl_cffi import requests as curl_requests
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# PLOTLY CONFIGURATION
+# orjson serializes NumPy arrays natively and much faster than the stdlib encoder
+pio.json.config.default_engine = "orjson"
 
 # PAGE CONFIGURATION
 st.set_page_config(
@@ -67,16 +84,204 @@ chart_type = st.sidebar.selectbox(
     help="Line charts show price trends, candlestick charts show OHLC data"
 )
 
+# Optional symbols to compare against the main symbol
+compare_input = st.sidebar.text_area(
+    "Compare Symbols (comma-separated):",
+    value="",
+    help="Plot the relative performance of other symbols alongside the selected one"
+)
+
 # Analysis trigger button
 analyze_button = st.sidebar.button("Analyze Stock", type="primary")
 
+# Price refresh trigger for pulling the latest historical data
+refresh_button = st.sidebar.button(
+    "Refresh Data",
+    help="Fetch the latest historical prices, keeping cached company info"
+)
+
+# Cache reset trigger for forcing fresh data from Yahoo Finance
+clear_cache_button = st.sidebar.button(
+    "Clear Cache",
+    help="Discard cached tickers and data and fetch everything again"
+)
+
 # DATA FETCHING FUNCTIONS
-def get_stock_info(symbol):
+@st.cache_resource
+def get_session():
+    """
+    Create the HTTP session shared by all Yahoo Finance requests.
+    
+    The session is created once per Streamlit server process so connections,
+    cookies and the Yahoo crumb are reused across reruns and user sessions.
+    
+    Returns:
+        curl_requests.Session: Browser-impersonating session accepted by yfinance
+    """
+    return curl_requests.Session(impersonate="chrome")
+
+
+@st.cache_resource(ttl=900, max_entries=64)
+def get_ticker(symbol, _session=None):
+    """
+    Get a reusable yfinance Ticker object for a symbol.
+    
+    Tickers are shared across reruns and user sessions. The TTL matches the
+    data caches since a Ticker keeps its fetched info internally, and the
+    entry cap bounds memory when many different symbols are looked up.
+    
+    Args:
+        symbol (str): Stock ticker symbol (e.g., 'AAPL', 'GOOGL')
+        _session: HTTP session for Yahoo requests (excluded from the cache key)
+        
+    Returns:
+        yf.Ticker: Ticker object bound to the shared session
+    """
+    return yf.Ticker(symbol, session=_session)
+
+
+# On-disk cache for company info, kept across app restarts and worker processes,
+# next to this script, so it does not depend on the working directory
+CACHE_DIR = Path(__file__).parent / ".stockcache"
+INFO_DISK_TTL = 3600  # seconds
+
+
+def info_cache_path(symbol):
+    """
+    Get the on-disk cache file for a symbol's company information.
+    
+    Args:
+        symbol (str): Stock ticker symbol (e.g., 'AAPL', 'GOOGL')
+        
+    Returns:
+        Path: JSON file inside CACHE_DIR, with unsafe characters replaced
+    """
+    safe_symbol = re.sub(r"[^A-Za-z0-9.^=-]", "_", symbol)
+    return CACHE_DIR / f"{safe_symbol}_info.json"
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def fetch_info(symbol):
+    """
+    Fetch company information and current metrics for a symbol.
+    
+    Company information changes slowly, so it is cached independently of
+    the historical data and shared across every selected time period.
+    Lookups go memory, then disk (up to INFO_DISK_TTL old), then network.
+    
+    Args:
+        symbol (str): Stock ticker symbol (e.g., 'AAPL', 'GOOGL')
+        
+    Returns:
+        dict: Company information and current metrics
+    """
+    cache_path = info_cache_path(symbol)
+    
+    # A missing, stale, unreadable or corrupt disk entry falls through to the network
+    try:
+        if time.time() - cache_path.stat().st_mtime < INFO_DISK_TTL:
+            return json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        pass
+    
+    info = get_ticker(symbol, get_session()).info
+    
+    # Write atomically through a unique temp file so concurrent writers never
+    # share or read a partial file; a failed write only skips the disk tier
+    temp_path = None
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=CACHE_DIR, suffix=".tmp", delete=False, encoding="utf-8"
+        ) as temp_file:
+            temp_path = Path(temp_file.name)
+            temp_file.write(json.dumps(info, default=str))
+        temp_path.replace(cache_path)
+    except (OSError, ValueError):
+        if temp_path is not None:
+            temp_path.unlink(missing_ok=True)
+    return info
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_history(symbol, period_code):
+    """
+    Fetch historical price and volume data for a symbol.
+    
+    Args:
+        symbol (str): Stock ticker symbol (e.g., 'AAPL', 'GOOGL')
+        period_code (str): yfinance period code (e.g., '1mo', '1y', 'max')
+        
+    Returns:
+        pd.DataFrame: Historical price and volume data with compact volume
+    """
+    hist_data = get_ticker(symbol, get_session()).history(period=period_code)
+    if hist_data.empty:
+        return hist_data
+    return downcast_history(hist_data)
+
+
+def downcast_history(hist_data):
+    """
+    Downcast an integer Volume column to uint32 when every value fits.
+    
+    Prices and other float columns stay float64 so statistics and the CSV
+    export keep full precision; only chart payloads are sent as float32.
+    
+    Args:
+        hist_data (pd.DataFrame): Historical price and volume data from yfinance
+        
+    Returns:
+        pd.DataFrame: Historical data with compact volume where lossless
+    """
+    volume = hist_data['Volume']
+    # Float volumes (e.g. with NaN gaps) cannot be cast and are left as they are
+    if not pd.api.types.is_integer_dtype(volume):
+        return hist_data
+    if volume.min() >= 0 and volume.max() <= np.iinfo(np.uint32).max:
+        return hist_data.astype({'Volume': 'uint32'})
+    return hist_data
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_comparison_history(symbols, period_code):
+    """
+    Fetch closing prices for several symbols with a single threaded download.
+    
+    Args:
+        symbols (tuple): Stock ticker symbols to download
+        period_code (str): yfinance period code (e.g., '1mo', '1y', 'max')
+        
+    Returns:
+        pd.DataFrame: Closing prices with one column per symbol that returned data
+    """
+    data = yf.download(
+        list(symbols),
+        period=period_code,
+        group_by='ticker',
+        threads=True,
+        progress=False,
+        session=get_session()
+    )
+    downloaded = set(data.columns.get_level_values(0))
+    closes = pd.DataFrame({
+        symbol: data[symbol]['Close'] for symbol in symbols if symbol in downloaded
+    })
+    return closes.dropna(axis=1, how='all').astype('float32')
+
+
+def get_stock_info(symbol, period_code):
     """
     Fetch comprehensive stock information and historical data from Yahoo Finance.
     
+    Company information and historical data are fetched concurrently and
+    cached (15 and 5 minutes respectively), so reruns triggered by unrelated
+    widget interactions are served from memory. Errors are not cached and are
+    retried on the next rerun.
+    
     Args:
         symbol (str): Stock ticker symbol (e.g., 'AAPL', 'GOOGL')
+        period_code (str): yfinance period code (e.g., '1mo', '1y', 'max')
         
     Returns:
         tuple: (info_dict, hist_dataframe, error_message)
@@ -84,21 +289,36 @@ def get_stock_info(symbol):
             - hist_dataframe: Historical price and volume data
             - error_message: Error description if fetch fails, None if successful
     """
+    # Overlap the two network round-trips: info is fetched on a single worker
+    # thread sharing this run's script context, history on the calling thread
+    with ThreadPoolExecutor(
+        max_workers=1,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    ) as executor:
+        info_future = executor.submit(fetch_info, symbol)
+        try:
+            hist_data, hist_error = fetch_history(symbol, period_code), None
+        except Exception as e:
+            hist_data, hist_error = None, e
+    
     try:
-        # Create yfinance Ticker object and fetch data
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        period_code = time_periods[selected_period]
-        hist_data = ticker.history(period=period_code)
-        
-        # Validate data availability
-        if hist_data.empty:
-            return None, None, "No historical data found for this symbol"
-            
-        return info, hist_data, None
-        
+        info = info_future.result()
     except Exception as e:
-        return None, None, f"Error fetching data: {str(e)}"
+        return None, None, f"Error fetching company info: {str(e)}"
+    
+    if hist_error is not None:
+        return None, None, f"Error fetching historical data: {str(hist_error)}"
+    
+    # Validate data availability
+    if hist_data.empty:
+        return None, None, "No historical data found for this symbol"
+        
+    return info, hist_data, None
+
+
+# Divisor and suffix for each power of one thousand, indexed by log10(num) // 3
+LARGE_NUMBER_SUFFIXES = [(1.0, ""), (1e3, "K"), (1e6, "M"), (1e9, "B"), (1e12, "T")]
 
 
 def format_large_number(num):
@@ -111,23 +331,86 @@ def format_large_number(num):
     Returns:
         str: Formatted number with suffix (e.g., "$1.23B", "$456.78K")
     """
-    if pd.isna(num) or num is None:
+    if num is None or pd.isna(num):
         return "N/A"
-        
-    abs_num = abs(num)
-    if abs_num >= 1e12:
-        return f"${num/1e12:.2f}T"
-    elif abs_num >= 1e9:
-        return f"${num/1e9:.2f}B"
-    elif abs_num >= 1e6:
-        return f"${num/1e6:.2f}M"
-    elif abs_num >= 1e3:
-        return f"${num/1e3:.2f}K"
+    
+    # Pick the suffix by order of magnitude instead of a chain of comparisons;
+    # infinities take the largest suffix, as they did with the comparisons
+    if not math.isfinite(num):
+        index = len(LARGE_NUMBER_SUFFIXES) - 1
     else:
-        return f"${num:.2f}"
+        index = min(max(int(math.log10(abs(num))) // 3, 0), 4) if num else 0
+    divisor, suffix = LARGE_NUMBER_SUFFIXES[index]
+    return f"${num/divisor:.2f}{suffix}"
 
 
 # DATA PRESENTATION FUNCTIONS
+# Value formatters applied to the tuple of raw values for a metric
+METRIC_FORMATTERS = {
+    "currency": lambda values: f"${values[0]:.2f}",
+    "range": lambda values: f"${values[0]:.2f} - ${values[1]:.2f}",
+    "count": lambda values: f"{values[0]:,}",
+    "large": lambda values: format_large_number(values[0]),
+    "ratio": lambda values: f"{values[0]:.2f}",
+    "percent": lambda values: f"{values[0]*100:.2f}%"
+}
+
+# Summary table layout: (metric label, yfinance info keys, pre-bound formatter)
+SUMMARY_METRICS = (
+    ("Current Price", ("currentPrice",), METRIC_FORMATTERS["currency"]),
+    ("Previous Close", ("previousClose",), METRIC_FORMATTERS["currency"]),
+    ("Day's Range", ("dayLow", "dayHigh"), METRIC_FORMATTERS["range"]),
+    ("52 Week Range", ("fiftyTwoWeekLow", "fiftyTwoWeekHigh"), METRIC_FORMATTERS["range"]),
+    ("Volume", ("volume",), METRIC_FORMATTERS["count"]),
+    ("Average Volume", ("averageVolume",), METRIC_FORMATTERS["count"]),
+    ("Market Cap", ("marketCap",), METRIC_FORMATTERS["large"]),
+    ("P/E Ratio", ("trailingPE",), METRIC_FORMATTERS["ratio"]),
+    ("EPS", ("trailingEps",), METRIC_FORMATTERS["currency"]),
+    ("Dividend Yield", ("dividendYield",), METRIC_FORMATTERS["percent"]),
+    ("Beta", ("beta",), METRIC_FORMATTERS["ratio"])
+)
+
+# Every info key read by the summary table, in SUMMARY_METRICS order
+SUMMARY_KEYS = tuple(key for _, keys, _ in SUMMARY_METRICS for key in keys)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def format_metrics(info_items):
+    """
+    Format raw metric values into the summary table.
+    
+    Args:
+        info_items (tuple): Raw values for SUMMARY_KEYS, in the same order,
+            hashable so results are cached across reruns
+        
+    Returns:
+        pd.DataFrame: Formatted summary table with metrics and values
+    """
+    values = dict(zip(SUMMARY_KEYS, info_items))
+    raw_values = [tuple(values.get(key) for key in keys) for _, keys, _ in SUMMARY_METRICS]
+    
+    return pd.DataFrame({
+        "Metric": [label for label, _, _ in SUMMARY_METRICS],
+        "Value": [
+            formatter(raw) if all(raw) else "N/A"
+            for (_, _, formatter), raw in zip(SUMMARY_METRICS, raw_values)
+        ]
+    })
+
+
+def get_summary_items(info):
+    """
+    Extract the raw values used by the summary table from an info dictionary.
+    
+    Args:
+        info (dict): Stock information dictionary from yfinance
+        
+    Returns:
+        tuple: Hashable values for SUMMARY_KEYS, suitable as a cache key
+    """
+    return tuple(info.get(key) for key in SUMMARY_KEYS)
+
+
 def create_summary_table(info):
     """
     Create a comprehensive summary table of key financial metrics.
@@ -138,40 +421,136 @@ def create_summary_table(info):
     Returns:
         pd.DataFrame: Formatted summary table with metrics and values
     """
-    summary_data = {
-        "Metric": [
-            "Current Price",
-            "Previous Close", 
-            "Day's Range",
-            "52 Week Range",
-            "Volume",
-            "Average Volume",
-            "Market Cap",
-            "P/E Ratio",
-            "EPS",
-            "Dividend Yield",
-            "Beta"
-        ],
-        "Value": [
-            f"${info.get('currentPrice', 'N/A'):.2f}" if info.get('currentPrice') else "N/A",
-            f"${info.get('previousClose', 'N/A'):.2f}" if info.get('previousClose') else "N/A",
-            f"${info.get('dayLow', 'N/A'):.2f} - ${info.get('dayHigh', 'N/A'):.2f}" 
-                if info.get('dayLow') and info.get('dayHigh') else "N/A",
-            f"${info.get('fiftyTwoWeekLow', 'N/A'):.2f} - ${info.get('fiftyTwoWeekHigh', 'N/A'):.2f}"
-                if info.get('fiftyTwoWeekLow') and info.get('fiftyTwoWeekHigh') else "N/A",
-            f"{info.get('volume', 'N/A'):,}" if info.get('volume') else "N/A",
-            f"{info.get('averageVolume', 'N/A'):,}" if info.get('averageVolume') else "N/A",
-            format_large_number(info.get('marketCap')),
-            f"{info.get('trailingPE', 'N/A'):.2f}" if info.get('trailingPE') else "N/A",
-            f"${info.get('trailingEps', 'N/A'):.2f}" if info.get('trailingEps') else "N/A",
-            f"{info.get('dividendYield', 0)*100:.2f}%" if info.get('dividendYield') else "N/A",
-            f"{info.get('beta', 'N/A'):.2f}" if info.get('beta') else "N/A"
-        ]
-    }
-    return pd.DataFrame(summary_data)
+    return format_metrics(get_summary_items(info))
+
+
+# Display formats for the recent historical data table, applied in the browser
+RECENT_DATA_COLUMN_CONFIG = {
+    **{
+        column: st.column_config.NumberColumn(format="%.2f")
+        for column in ['Open', 'High', 'Low', 'Close']
+    },
+    'Volume': st.column_config.NumberColumn(format="%d")
+}
+
+
+def create_metric_grid(metrics, columns=3):
+    """
+    Build an HTML grid of label/value metrics to render in a single element.
+    
+    One st.markdown call replaces a st.metric per value, so the grid costs
+    one element update per rerun instead of one per metric.
+    
+    Args:
+        metrics (list): (label, value) string pairs, laid out row by row
+        columns (int): Number of grid columns
+        
+    Returns:
+        str: HTML snippet for st.markdown(..., unsafe_allow_html=True)
+    """
+    # Dollar signs are entity-encoded so markdown does not treat them as LaTeX
+    cells = "".join(
+        "<div>"
+        f"<div style='font-size: 0.875rem; opacity: 0.7;'>{html.escape(label)}</div>"
+        f"<div style='font-size: 1.75rem;'>{html.escape(value).replace('$', '&#36;')}</div>"
+        "</div>"
+        for label, value in metrics
+    )
+    return (
+        f"<div style='display: grid; grid-template-columns: repeat({columns}, 1fr); "
+        f"gap: 1rem; margin-bottom: 1rem;'>{cells}</div>"
+    )
 
 
 # CHART CREATION FUNCTIONS
+# Maximum number of points sent to the browser for line and volume charts
+MAX_CHART_POINTS = 2000
+
+
+def downsample(hist_data, column, max_points=MAX_CHART_POINTS):
+    """
+    Reduce historical data to at most max_points rows with M4 aggregation.
+    
+    Rows are split into max_points / 4 equal bins and, for each bin, the
+    first, minimum, maximum and last rows of `column` are kept. Peaks and
+    troughs survive, so the downsampled line looks the same at screen width.
+    
+    Args:
+        hist_data (pd.DataFrame): Historical price and volume data
+        column (str): Column whose extremes must be preserved
+        max_points (int): Maximum number of rows to keep
+        
+    Returns:
+        pd.DataFrame: Original data if already small enough, otherwise a subset
+    """
+    num_rows = len(hist_data)
+    if num_rows <= max_points:
+        return hist_data
+    
+    # Pad the last bin with its final value so every bin has equal width
+    bin_size = -(-num_rows // (max_points // 4))  # Ceiling division
+    num_bins = -(-num_rows // bin_size)
+    values = np.pad(
+        hist_data[column].to_numpy(), (0, num_bins * bin_size - num_rows), mode='edge'
+    ).reshape(num_bins, bin_size)
+    
+    starts = np.arange(num_bins) * bin_size
+    positions = np.concatenate([
+        starts,
+        starts + values.argmin(axis=1),
+        starts + values.argmax(axis=1),
+        starts + bin_size - 1
+    ])
+    positions = np.unique(np.minimum(positions, num_rows - 1))
+    return hist_data.iloc[positions]
+
+
+def aggregate_ohlc(hist_data, max_points=MAX_CHART_POINTS):
+    """
+    Merge consecutive bars into at most max_points wider OHLC candles.
+    
+    Each candle opens at its first bar, closes at its last and spans the
+    highest high and lowest low in between, dated by its first bar.
+    
+    Args:
+        hist_data (pd.DataFrame): Historical OHLC data
+        max_points (int): Maximum number of candles to keep
+        
+    Returns:
+        pd.DataFrame: Original data if already small enough, otherwise aggregated candles
+    """
+    num_rows = len(hist_data)
+    if num_rows <= max_points:
+        return hist_data
+    
+    bin_size = -(-num_rows // max_points)  # Ceiling division
+    candles = hist_data.groupby(np.arange(num_rows) // bin_size).agg(
+        {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+    )
+    candles.index = hist_data.index[::bin_size]
+    return candles
+
+
+def chart_dates(hist_data):
+    """
+    Convert the history index to a NumPy datetime array for Plotly traces.
+    
+    Timestamps are converted to exchange-local wall time at millisecond
+    resolution in one vectorized cast, so Plotly does not convert each
+    pandas Timestamp to an ISO string during serialization.
+    
+    Args:
+        hist_data (pd.DataFrame): Historical data with a DatetimeIndex
+        
+    Returns:
+        np.ndarray: datetime64[ms] array of the index values
+    """
+    dates = hist_data.index
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ms]')
+
+
 def create_line_chart(hist_data, symbol):
     """
     Create an interactive line chart showing stock price trends.
@@ -183,11 +562,12 @@ def create_line_chart(hist_data, symbol):
     Returns:
         go.Figure: Interactive Plotly line chart
     """
+    hist_data = downsample(hist_data, 'Close')
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=hist_data.index,
-        y=hist_data['Close'],
+    fig.add_trace(go.Scattergl(
+        x=chart_dates(hist_data),
+        y=hist_data['Close'].to_numpy(dtype=np.float32),
         mode='lines',
         name='Close Price',
         line=dict(color='#1f77b4', width=2),
@@ -218,14 +598,17 @@ def create_candlestick_chart(hist_data, symbol):
     Returns:
         go.Figure: Interactive Plotly candlestick chart
     """
-    fig = go.Figure(data=go.Candlestick(
-        x=hist_data.index,
-        open=hist_data['Open'],
-        high=hist_data['High'],
-        low=hist_data['Low'],
-        close=hist_data['Close'],
-        name='OHLC'
-    ))
+    hist_data = aggregate_ohlc(hist_data)
+    fig = go.Figure(
+        data=go.Candlestick(
+            x=chart_dates(hist_data),
+            open=hist_data['Open'].to_numpy(dtype=np.float32),
+            high=hist_data['High'].to_numpy(dtype=np.float32),
+            low=hist_data['Low'].to_numpy(dtype=np.float32),
+            close=hist_data['Close'].to_numpy(dtype=np.float32),
+            name='OHLC'
+        )
+    )
     
     fig.update_layout(
         title=f'{symbol} Candlestick Chart',
@@ -241,22 +624,26 @@ def create_candlestick_chart(hist_data, symbol):
 
 def create_volume_chart(hist_data, symbol):
     """
-    Create a bar chart showing trading volume over time.
+    Create a WebGL area chart showing trading volume over time.
     
     Args:
         hist_data (pd.DataFrame): Historical volume data
         symbol (str): Stock symbol for chart title
         
     Returns:
-        go.Figure: Interactive Plotly bar chart
+        go.Figure: Interactive Plotly area chart
     """
+    hist_data = downsample(hist_data, 'Volume')
     fig = go.Figure()
     
-    fig.add_trace(go.Bar(
-        x=hist_data.index,
-        y=hist_data['Volume'],
+    fig.add_trace(go.Scattergl(
+        x=chart_dates(hist_data),
+        y=hist_data['Volume'].to_numpy(),
+        mode='lines',
+        fill='tozeroy',
         name='Volume',
-        marker_color='rgba(0, 150, 255, 0.6)',
+        line=dict(width=0),
+        fillcolor='rgba(0, 150, 255, 0.6)',
         hovertemplate='<b>Date</b>: %{x}<br><b>Volume</b>: %{y:,}<extra></extra>'
     ))
     
@@ -271,53 +658,216 @@ def create_volume_chart(hist_data, symbol):
     
     return fig
 
+
+def create_comparison_chart(closes, period_label):
+    """
+    Create a WebGL line chart comparing percentage change across symbols.
+    
+    Args:
+        closes (pd.DataFrame): Closing prices with one column per symbol
+        period_label (str): Selected time period label for the chart title
+        
+    Returns:
+        go.Figure: Interactive Plotly line chart of relative performance
+    """
+    fig = go.Figure()
+    
+    for symbol in closes.columns:
+        close = downsample(closes[[symbol]].dropna(), symbol)
+        if close.empty:
+            continue
+        values = close[symbol].to_numpy()
+        fig.add_trace(go.Scattergl(
+            x=chart_dates(close),
+            y=(values / values[0] - 1) * 100,
+            mode='lines',
+            name=symbol,
+            hovertemplate=f'<b>{symbol}</b>: %{{y:+.2f}}%<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        title=f'Relative Performance ({period_label})',
+        xaxis_title='Date',
+        yaxis_title='Change (%)',
+        hovermode='x unified',
+        showlegend=True,
+        height=500,
+        template='plotly_white'
+    )
+    
+    return fig
+
+# STATISTICS FUNCTIONS
+def compute_stats(hist_data):
+    """
+    Compute period statistics from historical data in as few passes as possible.
+    
+    Args:
+        hist_data (pd.DataFrame): Historical price and volume data
+        
+    Returns:
+        dict: Period high/low, average volume, annualized volatility,
+            total return and average daily return (percentages)
+    """
+    extrema = hist_data.agg({'High': 'max', 'Low': 'min', 'Volume': 'mean'})
+    close = hist_data['Close'].to_numpy(dtype=np.float64)
+    
+    # Daily returns computed once and shared by both reductions; undefined
+    # results are NaN directly, skipping NumPy's empty-slice warnings.
+    # Zero prices give inf/NaN as pandas division did, without warnings
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(close) / close[:-1]
+        total_return = (close[-1] / close[0] - 1) * 100
+    returns = returns[~np.isnan(returns)]
+    mean_return = returns.mean() if len(returns) > 0 else np.nan
+    std_return = returns.std(ddof=1) if len(returns) > 1 else np.nan
+    
+    return {
+        "period_high": extrema['High'],
+        "period_low": extrema['Low'],
+        "avg_volume": extrema['Volume'],
+        "volatility": std_return * np.sqrt(252) * 100,
+        "total_return": total_return,
+        "avg_daily_return": mean_return * 100
+    }
+
+
 # DATA EXPORT FUNCTIONS
-def prepare_csv_data(info, hist_data, symbol):
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def prepare_csv_data(summary_df, hist_data, symbol, period_label):
     """
     Prepare comprehensive data for CSV download including summary and historical data.
     
     Args:
-        info (dict): Stock information
+        summary_df (pd.DataFrame): Summary table from create_summary_table
         hist_data (pd.DataFrame): Historical price data
         symbol (str): Stock symbol
+        period_label (str): Selected time period label (e.g., '1 Year')
         
     Returns:
-        str: Formatted CSV data as string
+        bytes: Formatted CSV data, ready to pass to st.download_button
     """
-    # Create summary table
-    summary_df = create_summary_table(info)
+    # Wrap historical columns as Arrow arrays without copying the DataFrame;
+    # only the rounded float columns and the Date strings are new buffers.
+    # Dates keep their UTC offset and NaN becomes an empty field, as in to_csv
+    columns = {'Date': pa.array(hist_data.index.astype(str))}
+    for name in hist_data.columns:
+        values = pa.array(hist_data[name].to_numpy(), from_pandas=True)
+        columns[name] = pc.round(values, 2) if pa.types.is_floating(values.type) else values
+    hist_table = pa.table(columns)
     
-    # Prepare historical data
-    hist_df = hist_data.copy()
-    hist_df.index.name = 'Date'
-    hist_df = hist_df.round(2)
+    # Header and summary sections are small, so build them as one string
+    header = (
+        f"Stock Symbol: {symbol}\n"
+        f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"Time Period: {period_label}\n\n"
+        "SUMMARY METRICS\n"
+        + "=" * 50 + "\n"
+        + summary_df.to_csv(index=False)
+        + "\n\nHISTORICAL DATA\n"
+        + "=" * 50 + "\n"
+        + ",".join(hist_table.column_names) + "\n"
+    )
     
-    # Create CSV buffer
-    buffer = io.StringIO()
+    # Write historical rows with Arrow's columnar CSV writer; the header line
+    # is written above so it stays unquoted on every supported pyarrow
+    sink = pa.BufferOutputStream()
+    pacsv.write_csv(
+        hist_table,
+        sink,
+        write_options=pacsv.WriteOptions(include_header=False, quoting_style="none"),
+    )
     
-    # Write header information
-    buffer.write(f"Stock Symbol: {symbol}\n")
-    buffer.write(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    buffer.write(f"Time Period: {selected_period}\n\n")
+    return header.encode("utf-8") + sink.getvalue().to_pybytes()
+
+
+# ANALYSIS FUNCTIONS
+def run_analysis(symbol, period_label):
+    """
+    Fetch data and build the derived tables needed to render an analysis.
+    
+    Args:
+        symbol (str): Stock ticker symbol
+        period_label (str): Selected time period label (e.g., '1 Year')
+        
+    Returns:
+        dict: info, hist_data and error from get_stock_info, plus summary_df
+            and stats (None when the fetch failed)
+    """
+    info, hist_data, error = get_stock_info(symbol, time_periods[period_label])
+    analysis = {
+        "info": info,
+        "hist_data": hist_data,
+        "error": error,
+        "summary_df": None,
+        "stats": None
+    }
+    if error or info is None or hist_data is None:
+        return analysis
     
-    # Write summary metrics
-    buffer.write("SUMMARY METRICS\n")
-    buffer.write("=" * 50 + "\n")
-    summary_df.to_csv(buffer, index=False)
+    analysis["summary_df"] = create_summary_table(info)
+    analysis["stats"] = compute_stats(hist_data)
+    return analysis
+
+
+def create_charts(hist_data, symbol, chart_kind):
+    """
+    Build the figures for the selected chart type.
     
-    # Write historical data
-    buffer.write("\n\nHISTORICAL DATA\n")
-    buffer.write("=" * 50 + "\n")
-    hist_df.to_csv(buffer)
+    Args:
+        hist_data (pd.DataFrame): Historical price and volume data
+        symbol (str): Stock symbol for chart titles
+        chart_kind (str): Selected chart type ('Line Chart' or 'Candlestick Chart')
+        
+    Returns:
+        tuple: (price_fig, volume_fig), volume_fig is None for line charts
+    """
+    if chart_kind == "Line Chart":
+        return create_line_chart(hist_data, symbol), None
     
-    return buffer.getvalue()
+    # Candlestick chart with volume
+    return create_candlestick_chart(hist_data, symbol), create_volume_chart(hist_data, symbol)
+
 
 # MAIN APPLICATION LOGIC
+if refresh_button:
+    fetch_history.clear()
+    fetch_comparison_history.clear()
+    st.session_state.pop("analysis_key", None)
+
+if clear_cache_button:
+    get_ticker.clear()
+    fetch_info.clear()
+    fetch_history.clear()
+    fetch_comparison_history.clear()
+    try:
+        for cache_path in CACHE_DIR.glob("*_info.json"):
+            cache_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+    st.session_state.pop("analysis_key", None)
+
 if analyze_button or stock_symbol:
     if stock_symbol:
-        # Show loading indicator while fetching data
-        with st.spinner(f'Fetching data for {stock_symbol}...'):
-            info, hist_data, error = get_stock_info(stock_symbol)
+        # Only refetch when the symbol or period change or the user asks for it;
+        # other widget changes are served from the stored analysis
+        analysis_key = (stock_symbol, selected_period)
+        if analyze_button or st.session_state.get("analysis_key") != analysis_key:
+            # Show loading indicator while fetching data
+            with st.spinner(f'Fetching data for {stock_symbol}...'):
+                st.session_state["analysis"] = run_analysis(stock_symbol, selected_period)
+            st.session_state.pop("charts_key", None)
+            
+            # Only remember successful analyses so failures are retried next rerun
+            if st.session_state["analysis"]["summary_df"] is not None:
+                st.session_state["analysis_key"] = analysis_key
+            else:
+                st.session_state.pop("analysis_key", None)
+        
+        analysis = st.session_state["analysis"]
+        info = analysis["info"]
+        hist_data = analysis["hist_data"]
+        error = analysis["error"]
         
         # Handle errors and missing data
         if error:
@@ -332,12 +882,14 @@ if analyze_button or stock_symbol:
             company_name = info.get('shortName', info.get('longName', stock_symbol))
             st.header(f"{company_name} ({stock_symbol})")
             
+            # Summary is built once for both the metrics table and the CSV export
+            summary_df = analysis["summary_df"]
+            
             # Create two-column layout for metrics
             col1, col2 = st.columns([1, 1])
             
             with col1:
                 st.subheader("📊 Key Financial Metrics")
-                summary_df = create_summary_table(info)
                 st.dataframe(summary_df, use_container_width=True, hide_index=True)
             
             with col2:
@@ -358,66 +910,91 @@ if analyze_button or stock_symbol:
                     )
                 
                 # Display additional metrics
+                extra_metrics = []
                 if info.get('marketCap'):
-                    st.metric("Market Cap", format_large_number(info.get('marketCap')))
+                    extra_metrics.append(("Market Cap", format_large_number(info.get('marketCap'))))
                 if info.get('volume'):
-                    st.metric("Volume", f"{info.get('volume'):,}")
+                    extra_metrics.append(("Volume", f"{info.get('volume'):,}"))
+                if extra_metrics:
+                    st.markdown(create_metric_grid(extra_metrics, columns=1), unsafe_allow_html=True)
             
             # Display interactive charts
             st.subheader("📈 Interactive Charts")
             
-            if chart_type == "Line Chart":
-                price_fig = create_line_chart(hist_data, stock_symbol)
-                st.plotly_chart(price_fig, use_container_width=True)
-            else:
-                # Candlestick chart with volume
-                price_fig = create_candlestick_chart(hist_data, stock_symbol)
-                st.plotly_chart(price_fig, use_container_width=True)
-                
-                volume_fig = create_volume_chart(hist_data, stock_symbol)
+            # Rebuild figures only when the data or the chart type changed
+            charts_key = (analysis_key, chart_type)
+            if st.session_state.get("charts_key") != charts_key:
+                st.session_state["charts"] = create_charts(hist_data, stock_symbol, chart_type)
+                st.session_state["charts_key"] = charts_key
+            
+            price_fig, volume_fig = st.session_state["charts"]
+            st.plotly_chart(price_fig, use_container_width=True)
+            if volume_fig is not None:
                 st.plotly_chart(volume_fig, use_container_width=True)
             
-            # Display historical data table
-            st.subheader("📋 Historical Data")
-            st.write("Recent Historical Data (Last 10 Trading Days):")
-            recent_data = hist_data.tail(10).round(2)
-            st.dataframe(recent_data, use_container_width=True)
+            # Compare against other symbols, all fetched in one download
+            compare_symbols = [
+                symbol.strip().upper() for symbol in compare_input.split(",") if symbol.strip()
+            ]
+            if compare_symbols:
+                st.subheader("📊 Symbol Comparison")
+                symbols = tuple(dict.fromkeys([stock_symbol, *compare_symbols]))
+                try:
+                    with st.spinner(f'Fetching data for {", ".join(symbols)}...'):
+                        closes = fetch_comparison_history(symbols, time_periods[selected_period])
+                except Exception as e:
+                    closes = None
+                    st.warning(f"⚠️ Error fetching comparison data: {str(e)}")
+                
+                if closes is not None:
+                    missing = [symbol for symbol in symbols if symbol not in closes.columns]
+                    if missing:
+                        st.warning(f"⚠️ No data found for: {', '.join(missing)}")
+                    if not closes.empty:
+                        comparison_fig = create_comparison_chart(closes, selected_period)
+                        st.plotly_chart(comparison_fig, use_container_width=True)
             
-            # Data download section
-            st.subheader("💾 Download Data")
-            csv_data = prepare_csv_data(info, hist_data, stock_symbol)
-            st.download_button(
-                label="📥 Download Complete Data as CSV",
-                data=csv_data,
-                file_name=f"{stock_symbol}_financial_data_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                help="Download all financial data and historical prices as CSV file"
-            )
+            # Historical data and download in a collapsed section
+            with st.expander("📋 Historical Data & Download", expanded=False):
+                # Display historical data table
+                st.write("Recent Historical Data (Last 10 Trading Days):")
+                st.dataframe(
+                    hist_data.iloc[-10:],
+                    use_container_width=True,
+                    column_config=RECENT_DATA_COLUMN_CONFIG
+                )
+                
+                # Data download section, built only once the user asks for it
+                csv_request = (stock_symbol, selected_period)
+                if st.button("Prepare CSV Download"):
+                    st.session_state["csv_request"] = csv_request
+                
+                if st.session_state.get("csv_request") == csv_request:
+                    csv_data = prepare_csv_data(
+                        summary_df, hist_data, stock_symbol, selected_period
+                    )
+                    st.download_button(
+                        label="📥 Download Complete Data as CSV",
+                        data=csv_data,
+                        file_name=f"{stock_symbol}_financial_data_{datetime.now().strftime('%Y%m%d')}.csv",
+                        mime="text/csv",
+                        help="Download all financial data and historical prices as CSV file"
+                    )
             
             # Additional statistics in expandable section
             with st.expander("📊 Additional Statistics"):
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric("Period High", f"${hist_data['High'].max():.2f}")
-                    st.metric("Period Low", f"${hist_data['Low'].min():.2f}")
-                
-                with col2:
-                    avg_volume = hist_data['Volume'].mean()
-                    st.metric("Average Volume", f"{avg_volume:,.0f}")
-                    
-                    # Calculate annualized volatility
-                    volatility = hist_data['Close'].pct_change().std() * np.sqrt(252) * 100
-                    st.metric("Volatility (Annualized)", f"{volatility:.2f}%")
-                
-                with col3:
-                    # Calculate total return for the period
-                    total_return = ((hist_data['Close'].iloc[-1] / hist_data['Close'].iloc[0]) - 1) * 100
-                    st.metric("Total Return", f"{total_return:+.2f}%")
-                    
-                    # Calculate average daily return
-                    avg_daily_return = hist_data['Close'].pct_change().mean() * 100
-                    st.metric("Avg Daily Return", f"{avg_daily_return:+.3f}%")
+                stats = analysis["stats"]
+                st.markdown(
+                    create_metric_grid([
+                        ("Period High", f"${stats['period_high']:.2f}"),
+                        ("Average Volume", f"{stats['avg_volume']:,.0f}"),
+                        ("Total Return", f"{stats['total_return']:+.2f}%"),
+                        ("Period Low", f"${stats['period_low']:.2f}"),
+                        ("Volatility (Annualized)", f"{stats['volatility']:.2f}%"),
+                        ("Avg Daily Return", f"{stats['avg_daily_return']:+.3f}%")
+                    ]),
+                    unsafe_allow_html=True
+                )
     else:
         st.info("👆 Please enter a stock symbol in the sidebar to begin analysis.")
 